@@ -18,12 +18,16 @@ import os
 import re
 import sys
 from os import environ
-from typing import Optional, Tuple
-from jps_api_wrapper.pro import Pro
+from typing import TYPE_CHECKING, Optional, Tuple
+
+# jps_api_wrapper (and the requests/network stack under it) is only imported once
+# the arguments are valid, so --help and usage errors come back instantly
+if TYPE_CHECKING:
+	from jps_api_wrapper.pro import Pro
 
 ### functions
 def send_device_lock(
-	pro: Pro,
+	pro: "Pro",
 	management_id: str,
 	pin: str,
 	message: Optional[str] = None,
@@ -56,19 +60,11 @@ def send_device_lock(
 	# Jamf typically returns 202 Accepted on success
 	try:
 		j = r.json()
-	except requests.exceptions.JSONDecodeError:
+	except ValueError:  # requests' JSONDecodeError is a ValueError
 		j = {"raw": r.text}
 	return r.status_code, j
 
 ### Main ###
-JPS_URL = os.environ.get("JPS_URL", "https://punahou.jamfcloud.com")
-CLIENT_ID = os.environ.get("CLIENT_ID")
-CLIENT_SECRET = os.environ.get("CLIENT_SECRET")
-
-if not CLIENT_ID or not CLIENT_SECRET:
-	print("ERROR: Set CLIENT_ID and CLIENT_SECRET environment variables.", file=sys.stderr)
-	sys.exit(2)
-
 parser = argparse.ArgumentParser(
 	description="Jamf: Lookup managementId by serial and send DEVICE_LOCK."
 )
@@ -80,6 +76,18 @@ args = parser.parse_args()
 	
 serial = args.serial.strip().upper()
 pin = args.pin.strip()
+if not re.fullmatch(r"\d{6}", pin):
+	parser.error("PIN must be exactly 6 digits.")
+
+JPS_URL = os.environ.get("JPS_URL", "https://punahou.jamfcloud.com")
+CLIENT_ID = os.environ.get("CLIENT_ID")
+CLIENT_SECRET = os.environ.get("CLIENT_SECRET")
+
+if not CLIENT_ID or not CLIENT_SECRET:
+	print("ERROR: Set CLIENT_ID and CLIENT_SECRET environment variables.", file=sys.stderr)
+	sys.exit(2)
+
+from jps_api_wrapper.pro import Pro
 	
 print (serial)
 		
@@ -1,18 +1,18 @@
 #!/usr/bin/env python3
 
 import os, re, sys
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
 
 # GUI
 import tkinter as tk
 from tkinter import ttk, messagebox
 
-# HTTP / Jamf
-import requests
-from jps_api_wrapper.pro import Pro
+# HTTP / Jamf: jps_api_wrapper is imported on first submit so the dialog opens immediately
+if TYPE_CHECKING:
+	from jps_api_wrapper.pro import Pro
 
 
-def send_device_lock(pro: Pro, management_id: str, pin: str,
+def send_device_lock(pro: "Pro", management_id: str, pin: str,
 					message: Optional[str] = None, client_type: str = "COMPUTER") -> Tuple[int, dict]:
 	payload = {
 		"commandData": {"commandType": "DEVICE_LOCK", "pin": pin},
@@ -28,12 +28,12 @@ def send_device_lock(pro: Pro, management_id: str, pin: str,
 	)
 	try:
 		j = r.json()
-	except requests.exceptions.JSONDecodeError:
+	except ValueError:  # requests' JSONDecodeError is a ValueError
 		j = {"raw": r.text}
 	return r.status_code, j
 
 
-def get_inventory_by_serial(pro: Pro, serial_upper: str) -> dict:
+def get_inventory_by_serial(pro: "Pro", serial_upper: str) -> dict:
 	params = {
 		"section": "GENERAL,HARDWARE",
 		"page": 0,
@@ -119,6 +119,7 @@ class LockDialog(tk.Tk):
 		self.update_idletasks()
 		
 		try:
+			from jps_api_wrapper.pro import Pro
 			with Pro(url, client_id, client_secret, client=True) as pro:
 				inv = get_inventory_by_serial(pro, serial)
 				try:
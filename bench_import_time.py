@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Measure CLI cold-start import time and enforce a budget.
+
+Runs each Python tool in this folder with `-X importtime <script> --help` in a
+fresh interpreter, subtracts the bare interpreter's own imports, and fails if:
+- a script exits non-zero (it died before or instead of printing --help),
+- a script's imports take longer than the budget, or
+- a heavy dependency (requests, jps_api_wrapper, jamf_pro_sdk, pydantic, pyarrow)
+  is loaded just to print --help
+
+APILockTkinter.py has no --help (running it opens the dialog), so it is only
+imported; that still shows whether jps_api_wrapper loads before the first submit.
+It is skipped where tkinter isn't installed.
+
+The default budget is about twice the slowest script seen so far (13-49 ms on one
+machine, 70-79 ms on a slower one), so only a real regression trips it.
+
+Exit status 0 = within budget, 1 = over budget, so it can gate CI or a pre-commit hook.
+test_import_budget.py runs the same checks under pytest.
+
+Usage examples:
+  python bench_import_time.py
+  python bench_import_time.py --budget-ms 50 --runs 5 --verbose
+
+Requires: Python 3.8+
+"""
+
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+SCRIPTS = (
+    "APILock.py",
+    "jamf_smart_group_grep.py",
+    "static_group_membership.py",
+    "mdm_dispatch.py",
+    "criteria_index.py",
+    "snapshot_diff.py",
+    "reportSmartGroupCriteria.py",
+    "smartgroups_all.py",
+)
+
+# Scripts that open a window when run; these are imported instead
+GUI_SCRIPTS = ("APILockTkinter.py",)
+
+HEAVY_MODULES = ("requests", "urllib3", "jps_api_wrapper", "jamf_pro_sdk", "pydantic", "pyarrow")
+
+DEFAULT_BUDGET_MS = 150.0
+DEFAULT_RUNS = 3
+
+
+def import_profile(argv: List[str]) -> Tuple[Dict[str, int], int]:
+    """Runs python -X importtime argv; returns ({module: self time in microseconds}, exit status)."""
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + argv, cwd=HERE,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    modules: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        # "import time:       133 |        133 |   _io"
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header row
+        modules[parts[2].strip()] = int(parts[0])
+    return modules, proc.returncode
+
+
+def interpreter_baseline(runs: int) -> int:
+    """Import time of a bare `python -c pass` in microseconds, best of runs."""
+    return min(sum(import_profile(["-c", "pass"])[0].values()) for _ in range(max(1, runs)))
+
+
+def script_argv(script: str) -> List[str]:
+    if script in GUI_SCRIPTS:
+        return ["-c", f"import {os.path.splitext(script)[0]}"]
+    return [script, "--help"]
+
+
+def measure(script: str, runs: int, baseline_us: int) -> Tuple[float, List[str], int]:
+    """
+    Best-of-runs import time in ms (minus interpreter baseline), any heavy modules
+    loaded, and the first non-zero exit status seen (0 if every run succeeded).
+    """
+    best = None
+    heavy: List[str] = []
+    status = 0
+    for _ in range(runs):
+        modules, returncode = import_profile(script_argv(script))
+        total = sum(modules.values()) - baseline_us
+        best = total if best is None else min(best, total)
+        heavy = sorted({m for m in modules if m.split(".")[0] in HEAVY_MODULES})
+        status = status or returncode
+    return max(0, best or 0) / 1000.0, heavy, status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check --help cold-start import time of the Python tools.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"Max import time per script beyond the bare interpreter (default: {DEFAULT_BUDGET_MS})")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help=f"Runs per script, best is kept (default: {DEFAULT_RUNS})")
+    parser.add_argument("--verbose", action="store_true", help="Also list the 5 slowest imports per script")
+    parser.add_argument("scripts", nargs="*", default=list(SCRIPTS + GUI_SCRIPTS), help="Scripts to check (default: all tools)")
+    args = parser.parse_args()
+
+    baseline_us = interpreter_baseline(args.runs)
+
+    failed = False
+    for script in args.scripts:
+        if script in GUI_SCRIPTS and importlib.util.find_spec("tkinter") is None:
+            print(f"skip  {'':>10}  {script}  (tkinter not available)")
+            continue
+        ms, heavy, returncode = measure(script, max(1, args.runs), baseline_us)
+        over = ms > args.budget_ms
+        status = "FAIL" if over or heavy or returncode else "ok"
+        failed = failed or status == "FAIL"
+        note = f"  exited {returncode}" if returncode else ""
+        note += f"  loads {', '.join(heavy)}" if heavy else ""
+        print(f"{status:>4}  {ms:7.1f} ms  {script}{note}")
+        if args.verbose:
+            modules, _ = import_profile(script_argv(script))
+            for name, us in sorted(modules.items(), key=lambda x: -x[1])[:5]:
+                print(f"        {us / 1000:6.1f} ms  {name}")
+
+    print(f"\nBudget: {args.budget_ms:.0f} ms per script (beyond {baseline_us / 1000:.1f} ms interpreter startup)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
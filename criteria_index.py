@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Trigram index over cached smart group criteria for instant offline lookups.
+
+- Build: from a scan snapshot, i.e. a jamf_smart_group_grep.py --journal file
+  or the JSON output / --journal of reportSmartGroupCriteria.py
+- Search: substring queries narrow candidates by intersecting trigram posting
+  lists, then confirm with the same matcher as a live scan (build_matcher), so
+  results are the same Match records jamf_smart_group_grep.py would report
+- Similar: optional trigram-similarity ranking to catch near-misses
+  ("Google Chrome" vs "Chrome.app")
+
+Usage examples:
+  python jamf_smart_group_grep.py ... --pattern '.' --regex --journal scan.jsonl
+  python criteria_index.py build scan.jsonl --out criteria_index.json
+
+  python criteria_index.py search --index criteria_index.json --pattern 'Chrome'
+  python criteria_index.py search --index criteria_index.json --pattern 'Google Chrome' --similar --top 10
+
+Requires: Python 3.8+
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from criteria_snapshot import iter_snapshot_records, latest_records, record_key, record_name
+from jamf_smart_group_grep import Criterion, GroupSummary, Match, build_matcher, match_criteria, print_table, to_json
+
+
+# ---------- Configuration / Constants ----------
+
+INDEX_VERSION = 1
+SIMILARITY_THRESHOLD = 0.2
+DEFAULT_TOP = 20
+
+# Row layout in the saved index: one row per criterion
+ROW_FIELDS = ("tenant", "group_type", "group_id", "group_name", "name", "search_type", "value", "and_or")
+
+
+# ---------- Trigrams ----------
+
+def trigrams(text: Optional[str]) -> Set[str]:
+    if not text:
+        return set()
+    s = text.lower()
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+def similarity(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+# ---------- Snapshot Loading ----------
+
+def _group_from_record(rec: Dict[str, Any]) -> GroupSummary:
+    tenant, group_type, group_id = record_key(rec)
+    return GroupSummary(group_type=group_type, id=group_id, name=record_name(rec), is_smart=True, tenant=tenant)
+
+
+# ---------- Index ----------
+
+class CriteriaIndex:
+    def __init__(self, rows: Optional[List[list]] = None, postings: Optional[Dict[str, List[int]]] = None):
+        self.rows: List[list] = rows or []
+        self.postings: Dict[str, List[int]] = postings or {}
+
+    # ---- Build / persist ----
+    @classmethod
+    def build(cls, records: Iterable[Dict[str, Any]]) -> "CriteriaIndex":
+        """Snapshots should be given oldest first; a group seen more than once is indexed from its last copy."""
+        index = cls()
+        for rec in latest_records(records).values():
+            g = _group_from_record(rec)
+            for c in rec.get("criteria") or []:
+                row_id = len(index.rows)
+                name = str(c.get("name") or "")
+                value = str(c["value"]) if c.get("value") is not None else None
+                index.rows.append([g.tenant, g.group_type, g.id, g.name, name, c.get("search_type"), value, c.get("and_or")])
+                # Row ids only grow, so every posting list stays sorted
+                for tri in trigrams(name) | trigrams(value):
+                    index.postings.setdefault(tri, []).append(row_id)
+        return index
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"version": INDEX_VERSION, "fields": ROW_FIELDS, "rows": self.rows, "postings": self.postings},
+                      fh, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: str) -> "CriteriaIndex":
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"{path} is not a version {INDEX_VERSION} criteria index; rebuild it.")
+        return cls(rows=data["rows"], postings=data["postings"])
+
+    # ---- Query ----
+    def _row_parts(self, row_id: int) -> Tuple[GroupSummary, Criterion]:
+        tenant, gt, gid, gname, name, search_type, value, and_or = self.rows[row_id]
+        return (GroupSummary(group_type=gt, id=gid, name=gname, is_smart=True, tenant=tenant),
+                Criterion(name=name, search_type=search_type, value=value, and_or=and_or))
+
+    def candidates(self, query: str) -> Iterable[int]:
+        """Row ids that contain every trigram of query (a superset of the true matches)."""
+        grams = trigrams(query)
+        if not grams:
+            return range(len(self.rows))  # too short to narrow down
+        lists = []
+        for tri in grams:
+            posting = self.postings.get(tri)
+            if not posting:
+                return []
+            lists.append(posting)
+        lists.sort(key=len)
+        result = set(lists[0])
+        for posting in lists[1:]:
+            result.intersection_update(posting)
+            if not result:
+                break
+        return sorted(result)
+
+    def search(self, pattern: str, use_regex: bool = False, case_insensitive: bool = True) -> List[Match]:
+        matcher = build_matcher(pattern, use_regex, case_insensitive)
+        # Regexes have no fixed substring to narrow on; they are checked against every row
+        row_ids = range(len(self.rows)) if use_regex else self.candidates(pattern)
+        matches: List[Match] = []
+        for row_id in row_ids:
+            group, criterion = self._row_parts(row_id)
+            matches.extend(match_criteria(group, [criterion], matcher))
+        return matches
+
+    def similar(self, query: str, top: int = DEFAULT_TOP,
+                threshold: float = SIMILARITY_THRESHOLD) -> List[Tuple[float, Match]]:
+        """Ranks rows by trigram similarity of query to criterion name or value."""
+        q = trigrams(query)
+        # Only rows sharing at least one trigram with the query can score above zero
+        shared = {row_id for tri in q for row_id in self.postings.get(tri, ())}
+        scored: List[Tuple[float, Match]] = []
+        for row_id in shared:
+            group, criterion = self._row_parts(row_id)
+            field_name, score = max(
+                (("name", similarity(q, trigrams(criterion.name))), ("value", similarity(q, trigrams(criterion.value)))),
+                key=lambda x: x[1],
+            )
+            if score >= threshold:
+                scored.append((score, Match(
+                    group_type=group.group_type,
+                    group_id=group.id,
+                    group_name=group.name,
+                    matched_field=field_name,
+                    criterion=criterion,
+                    tenant=group.tenant,
+                )))
+        scored.sort(key=lambda x: (-x[0], x[1].group_name.lower()))
+        return scored[:top]
+
+
+# ---------- Output Helpers ----------
+
+def print_similar(ranked: List[Tuple[float, Match]]) -> None:
+    if not ranked:
+        print("No similar criteria found.")
+        return
+    for score, m in ranked:
+        c = m.criterion
+        where = f"{m.tenant} / " if m.tenant else ""
+        val = c.value if c.value is not None else "—"
+        print(f"  {score:.2f}  [{where}{m.group_type}] {m.group_name} (id={m.group_id}) → name='{c.name}', value='{val}'")
+
+
+# ---------- Main ----------
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query a trigram index of cached smart group criteria.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_build = sub.add_parser("build", help="Build an index from one or more scan snapshots")
+    p_build.add_argument("snapshots", nargs="+",
+                         help="--journal files or JSON exports of smart group criteria, oldest first (later copies win)")
+    p_build.add_argument("--out", required=True, help="Where to write the index")
+
+    p_search = sub.add_parser("search", help="Query a saved index")
+    p_search.add_argument("--index", required=True, help="Index written by 'build'")
+    p_search.add_argument("--pattern", required=True, help="String (or regex with --regex) to find")
+    p_search.add_argument("--regex", action="store_true", help="Interpret --pattern as a regular expression")
+    p_search.add_argument("--case-insensitive", action="store_true", default=True, help="Case-insensitive match (default: on)")
+    p_search.add_argument("--case-sensitive", action="store_false", dest="case_insensitive", help="Case-sensitive match")
+    p_search.add_argument("--similar", action="store_true", help="Rank near-misses by trigram similarity instead")
+    p_search.add_argument("--top", type=int, default=DEFAULT_TOP, help=f"Results for --similar (default: {DEFAULT_TOP})")
+    p_search.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD,
+                          help=f"Minimum similarity for --similar (default: {SIMILARITY_THRESHOLD})")
+    p_search.add_argument("--json", action="store_true", help="Output JSON instead of a text table")
+
+    args = parser.parse_args()
+
+    if args.command == "build":
+        records = (rec for path in args.snapshots for rec in iter_snapshot_records(path))
+        index = CriteriaIndex.build(records)
+        index.save(args.out)
+        print(f"Indexed {len(index.rows)} criteria ({len(index.postings)} trigrams) → {args.out}", file=sys.stderr)
+        return
+
+    try:
+        index = CriteriaIndex.load(args.index)
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(f"Cannot load --index: {e}")
+
+    if args.similar:
+        ranked = index.similar(args.pattern, top=args.top, threshold=args.threshold)
+        if args.json:
+            payload = json.loads(to_json([m for _, m in ranked]))
+            for item, (score, _) in zip(payload, ranked):
+                item["score"] = round(score, 4)
+            print(json.dumps(payload, indent=2))
+        else:
+            print_similar(ranked)
+        return
+
+    matches = index.search(args.pattern, use_regex=args.regex, case_insensitive=args.case_insensitive)
+    if args.json:
+        print(to_json(matches))
+    else:
+        print_table(matches)
+
+
+if __name__ == "__main__":
+    main()
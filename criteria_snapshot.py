@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Columnar (Parquet / Arrow IPC) snapshots of smart group criteria.
+
+Rows are streamed to disk in batches as groups are exported, one row per
+criterion (a group without criteria gets a single row with empty criterion
+columns, so every group is present). Low-cardinality columns (group_type,
+site, name, search_type, and_or) are dictionary-encoded.
+
+Every group also carries criteria_hash, an order-independent digest of its
+criteria, so snapshot_diff.py can skip unchanged groups without comparing them.
+
+Used by reportSmartGroupCriteria.py and smartgroups_all.py (--format parquet|arrow).
+
+Also home to the JSON snapshot reader shared by criteria_index.py and
+snapshot_diff.py: a --journal file or a JSON array export, one record per group,
+deduplicated so the latest copy of a group wins.
+
+Requires: Python 3.8+, pyarrow (pip3 install pyarrow) for parquet/arrow output
+"""
+
+import hashlib
+import json
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from scan_journal import is_header
+
+FORMATS = ("json", "parquet", "arrow")
+BATCH_ROWS = 10000
+
+COLUMNS = ("group_id", "group_type", "group_name", "site", "criteria_hash",
+           "criterion_index", "name", "search_type", "value", "and_or")
+CRITERION_FIELDS = ("name", "search_type", "value", "and_or")
+DICTIONARY_COLUMNS = ("group_type", "site", "name", "search_type", "and_or")
+
+
+def criterion_key(c: Dict[str, Any]) -> Tuple[str, ...]:
+    """Normalized (name, search_type, value, and_or); None and "" compare equal."""
+    return tuple("" if c.get(f) is None else str(c.get(f)) for f in CRITERION_FIELDS)
+
+
+def criteria_hash(criteria: Iterable[Dict[str, Any]]) -> str:
+    """Digest of a group's criteria that ignores list order and key layout."""
+    canonical = sorted(criterion_key(c) for c in criteria or [])
+    return hashlib.blake2b(json.dumps(canonical, separators=(",", ":")).encode("utf-8"), digest_size=16).hexdigest()
+
+
+GroupKey = Tuple[Optional[str], str, int]  # (tenant, group_type, group_id)
+
+
+def record_key(rec: Dict[str, Any]) -> GroupKey:
+    # jamf_smart_group_grep journals use group_*; reportSmartGroupCriteria exports computer groups as id/name
+    return (rec.get("tenant"), rec.get("group_type", "computer"), int(rec.get("group_id", rec.get("id", 0))))
+
+
+def record_name(rec: Dict[str, Any]) -> str:
+    return str(rec.get("group_name", rec.get("name", "")))
+
+
+def iter_snapshot_records(path: str) -> Iterator[Dict[str, Any]]:
+    """Yields group records from a JSON-lines journal or a JSON array snapshot, in file order."""
+    with open(path, "r", encoding="utf-8") as fh:
+        head = fh.read(1)
+        while head and head.isspace():
+            head = fh.read(1)
+        fh.seek(0)
+        if head == "[":
+            yield from json.load(fh)
+            return
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"WARNING: skipping unreadable line in {path}", file=sys.stderr)
+                continue
+            if not is_header(rec):
+                yield rec
+
+
+def latest_records(records: Iterable[Dict[str, Any]]) -> Dict[GroupKey, Dict[str, Any]]:
+    """
+    One record per group. A resumed journal, or several snapshots read oldest
+    first, can repeat a group; the last copy wins.
+    """
+    latest: Dict[GroupKey, Dict[str, Any]] = {}
+    for rec in records:
+        latest[record_key(rec)] = rec
+    return latest
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet/Arrow output requires pyarrow (pip3 install pyarrow).") from None
+    return pyarrow
+
+
+class _DictionaryEncoder:
+    """
+    Grows one dictionary for the whole file so each batch's dictionary extends the
+    previous one (written as a delta in Arrow IPC, and shared across Parquet row groups).
+    """
+
+    def __init__(self):
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def encode(self, column: Iterable[Optional[str]]) -> List[Optional[int]]:
+        codes: List[Optional[int]] = []
+        for v in column:
+            if v is None:
+                codes.append(None)
+                continue
+            code = self._index.get(v)
+            if code is None:
+                code = self._index[v] = len(self.values)
+                self.values.append(v)
+            codes.append(code)
+        return codes
+
+
+class CriteriaRowWriter:
+    def __init__(self, path: str, fmt: str = "parquet", batch_rows: int = BATCH_ROWS):
+        if fmt not in ("parquet", "arrow"):
+            raise ValueError(f"Unsupported columnar format '{fmt}'")
+        self.pa = require_pyarrow()
+        pa = self.pa
+        self.path = path
+        self.fmt = fmt
+        self.batch_rows = max(1, batch_rows)
+        self.rows_written = 0
+        dict_type = pa.dictionary(pa.int32(), pa.string())
+        self.schema = pa.schema([
+            ("group_id", pa.int64()),
+            ("group_type", dict_type),
+            ("group_name", pa.string()),
+            ("site", dict_type),
+            ("criteria_hash", pa.string()),
+            ("criterion_index", pa.int32()),
+            ("name", dict_type),
+            ("search_type", dict_type),
+            ("value", pa.string()),
+            ("and_or", dict_type),
+        ])
+        self._encoders = {col: _DictionaryEncoder() for col in DICTIONARY_COLUMNS}
+        self._buffer: Dict[str, List[Any]] = {col: [] for col in COLUMNS}
+        if fmt == "parquet":
+            self._writer = pa.parquet.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            options = pa.ipc.IpcWriteOptions(compression="zstd", emit_dictionary_deltas=True)
+            self._writer = pa.ipc.new_file(path, self.schema, options=options)
+
+    def add_group(self, group_id: int, group_type: str, group_name: str, site: Optional[str],
+                  criteria: List[Dict[str, Any]]) -> None:
+        buf = self._buffer
+        digest = criteria_hash(criteria)
+        for i, c in enumerate(criteria or [None]):
+            buf["group_id"].append(group_id)
+            buf["group_type"].append(group_type)
+            buf["group_name"].append(group_name)
+            buf["site"].append(site)
+            buf["criteria_hash"].append(digest)
+            buf["criterion_index"].append(i if c is not None else None)
+            for key in CRITERION_FIELDS:
+                val = c.get(key) if c is not None else None
+                buf[key].append(str(val) if val is not None else None)
+        if len(buf["group_id"]) >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        pa = self.pa
+        n = len(self._buffer["group_id"])
+        if not n:
+            return
+        arrays = []
+        for field in self.schema:
+            col = self._buffer[field.name]
+            if field.name in self._encoders:
+                enc = self._encoders[field.name]
+                codes = pa.array(enc.encode(col), type=pa.int32())
+                arrays.append(pa.DictionaryArray.from_arrays(codes, pa.array(enc.values, type=pa.string())))
+            else:
+                arrays.append(pa.array(col, type=field.type))
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        self.rows_written += n
+        self._buffer = {col: [] for col in COLUMNS}
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self) -> "CriteriaRowWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
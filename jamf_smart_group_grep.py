@@ -6,6 +6,11 @@ Search Jamf Smart Group criteria for a matching string or regex.
 - Scans: Computer Smart Groups, Mobile Device Smart Groups, and User Smart Groups
 - Matches: criteria.name and criteria.value (case-insensitive by default)
 - Output: human-readable table OR JSON
+- Resume: --journal records each scanned group; --resume skips groups already in it
+  (refused if the journal was written for other servers or --include types)
+- Tenants: --tenants config.json scans several Jamf instances in parallel
+- Early exit: --limit N / --exists stop fetching once the answer is known; likely
+  groups (name looks related, hit in earlier runs via --history) are fetched first
 
 Usage examples:
   python jamf_smart_group_grep.py \
@@ -18,6 +23,17 @@ Usage examples:
     --user API_USER --password '********' \
     --pattern '(?i)^department$' --regex --include computer mobile --json
 
+  # Nightly crawl that can be restarted where it stopped
+  python jamf_smart_group_grep.py ... --pattern 'Chrome' --journal scan.jsonl
+  python jamf_smart_group_grep.py ... --pattern 'Chrome' --journal scan.jsonl --resume
+
+  # Every tenant in one run (see load_tenants for the config layout)
+  python jamf_smart_group_grep.py --tenants tenants.json --pattern 'Chrome' --max-workers 16
+
+  # Is "Zoom" referenced by any smart group? (exit status 0 = yes, 1 = no,
+  # 2 = unknown because some groups couldn't be fetched)
+  python jamf_smart_group_grep.py ... --pattern 'Zoom' --exists --history ~/.jamf_sg_history.json
+
 Requires: Python 3.8+
 """
 
@@ -27,14 +43,23 @@ import json
 import os
 import re
 import sys
+import threading
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urljoin
 
-import requests
 from xml.etree import ElementTree as ET
 
+from criteria_snapshot import criteria_hash
+from scan_journal import ScanJournal
+
+# requests is imported by JamfClient itself so offline users of this module
+# (criteria_index.py, --help, argument errors) don't load the HTTP stack
+if TYPE_CHECKING:
+    import requests
+
 
 # ---------- Configuration / Constants ----------
 
@@ -55,6 +80,8 @@ CLASSIC_DETAIL_ROOT_KEY = {
 DEFAULT_TIMEOUT = 30
 REQUESTS_RETRIES = 3
 THREADS = 10
+WINDOW_FACTOR = 2           # outstanding detail requests per tenant = WINDOW_FACTOR x its concurrency
+CANCEL_POLL_INTERVAL = 0.5  # seconds between checks for Ctrl-C while waiting on requests
 
 
 # ---------- Dataclasses ----------
@@ -65,6 +92,7 @@ class GroupSummary:
     id: int
     name: str
     is_smart: bool
+    tenant: Optional[str] = None
 
 
 @dataclass
@@ -82,6 +110,7 @@ class Match:
     group_name: str
     matched_field: str  # "name" or "value"
     criterion: Criterion
+    tenant: Optional[str] = None
 
 
 # ---------- Jamf API Client ----------
@@ -92,7 +121,9 @@ class JamfClient:
         self.username = username
         self.password = password
         self._token = token
+        self._token_lock = threading.Lock()
         self.verify_ssl = verify_ssl
+        import requests
         self.session = requests.Session()
         self.session.headers.update({"Accept": "application/json"})
         self.session.verify = verify_ssl
@@ -101,6 +132,13 @@ class JamfClient:
     def token(self) -> str:
         if self._token:
             return self._token
+        # Listings start in parallel; only the first caller requests a token, the rest wait for it
+        with self._token_lock:
+            if self._token:
+                return self._token
+            return self._request_token()
+
+    def _request_token(self) -> str:
         if not (self.username and self.password):
             raise RuntimeError("Username/password or a pre-existing token is required.")
         url = urljoin(self.base, "/api/v1/auth/token")
@@ -108,11 +146,12 @@ class JamfClient:
             resp = self.session.post(url, auth=(self.username, self.password), headers={"Accept": "application/json"}, timeout=DEFAULT_TIMEOUT)
             if resp.ok:
                 data = resp.json()
-                self._token = data.get("token")
-                if not self._token:
+                token = data.get("token")
+                if not token:
                     raise RuntimeError("Token response did not include 'token'.")
                 # Attach Authorization header for subsequent requests
-                self.session.headers["Authorization"] = f"Bearer {self._token}"
+                self.session.headers["Authorization"] = f"Bearer {token}"
+                self._token = token
                 return self._token
             if attempt == REQUESTS_RETRIES:
                 raise RuntimeError(f"Token request failed: {resp.status_code} {resp.text}")
@@ -146,6 +185,18 @@ class JamfClient:
         resp.raise_for_status()
         raise RuntimeError(f"Unexpected response from {url}: {resp.status_code} {resp.text}")
 
+    def _classic_put(self, path: str, xml_body: bytes) -> "requests.Response":
+        """
+        PUTs an XML document to the Classic API and returns the raw response;
+        callers decide how to handle non-2xx statuses.
+        """
+        self.token()
+        url = urljoin(self.base, f"/JSSResource/{path}".lstrip("/"))
+        headers = dict(self.session.headers)
+        headers["Accept"] = "application/xml"
+        headers["Content-Type"] = "text/xml"
+        return self.session.put(url, data=xml_body, headers=headers, timeout=DEFAULT_TIMEOUT)
+
     # ---- Listing & detail ----
     def list_groups(self, group_type: str) -> List[GroupSummary]:
         if group_type not in GROUP_TYPES:
@@ -231,6 +282,38 @@ class JamfClient:
         return crits
 
 
+    def get_computer_group_members(self, group_id: int) -> Tuple[GroupSummary, List[str]]:
+        """Returns the group summary and the serial numbers of its member computers."""
+        endpoint = f"{CLASSIC_COLLECTION_ENDPOINT['computer']}/id/{group_id}"
+        json_obj, xml_root = self._classic_get(endpoint)
+
+        if json_obj is not None:
+            root = json_obj.get("computer_group", {})
+            group = GroupSummary(
+                group_type="computer",
+                id=int(root.get("id", group_id)),
+                name=str(root.get("name", "")),
+                is_smart=bool(root.get("is_smart", False)),
+            )
+            computers = root.get("computers") or []
+            if isinstance(computers, dict):
+                computers = [computers]
+            serials = [str(c.get("serial_number") or "") for c in computers]
+            return group, [sn for sn in serials if sn]
+
+        root_node = xml_root if xml_root.tag == "computer_group" else xml_root.find(".//computer_group")
+        if root_node is None:
+            raise RuntimeError(f"Computer group {group_id} response had no <computer_group> element.")
+        group = GroupSummary(
+            group_type="computer",
+            id=int(root_node.findtext("id") or group_id),
+            name=root_node.findtext("name") or "",
+            is_smart=(root_node.findtext("is_smart") or "").strip().lower() == "true",
+        )
+        serials = [(c.findtext("serial_number") or "") for c in root_node.findall("./computers/computer")]
+        return group, [sn for sn in serials if sn]
+
+
 # ---------- Search / Match Logic ----------
 
 def build_matcher(pattern: str, use_regex: bool, case_insensitive: bool):
@@ -250,9 +333,8 @@ def build_matcher(pattern: str, use_regex: bool, case_insensitive: bool):
         return substr_match
 
 
-def scan_group(client: JamfClient, group: GroupSummary, matches_func) -> List[Match]:
+def match_criteria(group: GroupSummary, criteria: List[Criterion], matches_func) -> List[Match]:
     found: List[Match] = []
-    criteria = client.get_group_criteria(group.group_type, group.id)  # static groups => empty criteria
     for c in criteria:
         for field_name in ("name", "value"):
             val = getattr(c, field_name)
@@ -264,18 +346,301 @@ def scan_group(client: JamfClient, group: GroupSummary, matches_func) -> List[Ma
                         group_name=group.name,
                         matched_field=field_name,
                         criterion=c,
+                        tenant=group.tenant,
                     )
                 )
                 break  # don’t duplicate per-criterion
     return found
 
 
+def scan_group(client: JamfClient, group: GroupSummary, matches_func, journal: Optional[ScanJournal] = None) -> List[Match]:
+    criteria = client.get_group_criteria(group.group_type, group.id)  # static groups => empty criteria
+    if journal is not None:
+        journal.record(journal_record(group, criteria))
+    return match_criteria(group, criteria, matches_func)
+
+
+# ---------- Progress Journal ----------
+
+def journal_key(rec: Dict[str, Any]) -> Tuple[Optional[str], str, int]:
+    return (rec.get("tenant"), rec["group_type"], int(rec["group_id"]))
+
+
+def journal_header(tenants: List["Tenant"], include: Iterable[str]) -> Dict[str, Any]:
+    """What a journal was scanned from; --resume refuses a journal written for anything else."""
+    return {
+        "servers": sorted([t.name, t.client.base] for t in tenants),
+        "group_types": sorted(set(include)),
+    }
+
+
+def journal_record(group: GroupSummary, criteria: List[Criterion]) -> Dict[str, Any]:
+    rec = {
+        "tenant": group.tenant,
+        "group_type": group.group_type,
+        "group_id": group.id,
+        "group_name": group.name,
+        "criteria": [asdict(c) for c in criteria],
+    }
+    rec["criteria_hash"] = criteria_hash(rec["criteria"])
+    return rec
+
+
+def journaled_criteria(rec: Dict[str, Any]) -> List[Criterion]:
+    return [Criterion(**c) for c in rec.get("criteria", [])]
+
+
+# ---------- Scan Order / Early Termination ----------
+
+class MatchLimit:
+    """Counts matches across all tenants and signals once `limit` is reached."""
+
+    def __init__(self, limit: Optional[int]):
+        self.limit = limit
+        self.count = 0
+        self.reached = threading.Event()
+        self._lock = threading.Lock()
+
+    def add(self, n: int) -> None:
+        if not self.limit or not n:
+            return
+        with self._lock:
+            self.count += n
+            if self.count >= self.limit:
+                self.reached.set()
+
+
+def history_key(group: GroupSummary) -> str:
+    return f"{group.tenant or ''}:{group.group_type}:{group.id}"
+
+
+def load_history(path: Optional[str]) -> Dict[str, int]:
+    """Per-group hit counts from earlier runs ({} if the file is missing or unreadable)."""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return {str(k): int(v) for k, v in json.load(fh).get("hits", {}).items()}
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"WARNING: ignoring unreadable history {path}: {e}", file=sys.stderr)
+        return {}
+
+
+def save_history(path: str, history: Dict[str, int], matches: List[Match]) -> None:
+    hit_groups = {history_key(GroupSummary(m.group_type, m.group_id, m.group_name, True, m.tenant)) for m in matches}
+    for key in hit_groups:
+        history[key] = history.get(key, 0) + 1
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump({"hits": history}, fh)
+    os.replace(tmp, path)
+
+
+def build_priority(pattern: str, matches_func, history: Dict[str, int]):
+    """
+    Returns a sort key putting likely matches first: groups whose name matches the
+    pattern, then names sharing a word with it, then groups that hit in earlier runs.
+    """
+    words = set(re.findall(r"[a-z0-9]{3,}", pattern.lower()))
+
+    def priority(group: GroupSummary) -> Tuple[int, int, int]:
+        name = group.name.lower()
+        return (
+            -int(bool(matches_func(group.name))),
+            -sum(1 for w in words if w in name),
+            -history.get(history_key(group), 0),
+        )
+    return priority
+
+
+# ---------- Multi-tenant Scanning ----------
+
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all threads sharing it."""
+
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+@dataclass
+class Tenant:
+    name: Optional[str]
+    client: JamfClient
+    max_concurrency: int = THREADS
+    rate_limit: Optional[float] = None  # detail requests per second; None = unlimited
+    errors: int = 0  # failed listings / group fetches in the last scan_tenant run
+
+
+def _config_secret(entry: Dict[str, Any], key: str) -> Optional[str]:
+    # Prefer "<key>_env" so credentials can stay out of the config file
+    env_name = entry.get(f"{key}_env")
+    if env_name:
+        return os.getenv(env_name)
+    return entry.get(key)
+
+
+def load_tenants(path: str, verify_ssl: bool = True) -> Tuple[List[Tenant], Optional[int]]:
+    """
+    Reads a JSON tenant config. Returns (tenants, max_workers or None).
+
+    {
+      "max_workers": 16,
+      "tenants": [
+        {"name": "prod", "url": "https://prod.jamfcloud.com",
+         "user": "api_ro", "password_env": "PROD_JAMF_PASS",
+         "max_concurrency": 8, "rate_limit": 20},
+        {"name": "test", "url": "https://test.jamfcloud.com", "token_env": "TEST_JAMF_TOKEN"}
+      ]
+    }
+
+    A tenant's "verify_ssl" is only honoured when verify_ssl is True; --no-verify-ssl
+    on the command line wins over the config.
+    """
+    with open(path, "r", encoding="utf-8") as fh:
+        cfg = json.load(fh)
+    if not isinstance(cfg, dict) or not isinstance(cfg.get("tenants", []), list):
+        raise ValueError(f"{path} must be a JSON object with a 'tenants' list.")
+
+    def number(entry: Dict[str, Any], key: str, kind, where: str):
+        value = entry.get(key)
+        if value is None:
+            return None
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f"{where}: '{key}' must be a non-negative number.")
+        return kind(value) or None  # 0 means "use the default"
+
+    tenants: List[Tenant] = []
+    for i, entry in enumerate(cfg.get("tenants", [])):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Tenant #{i + 1} in {path} must be a JSON object.")
+        url = entry.get("url")
+        if not url or not isinstance(url, str):
+            raise ValueError(f"Tenant #{i + 1} in {path} has no 'url'.")
+        name = str(entry.get("name") or url)
+        username = _config_secret(entry, "user")
+        password = _config_secret(entry, "password")
+        token = _config_secret(entry, "token")
+        if not token and not (username and password):
+            raise ValueError(f"Tenant '{name}' needs token or user/password (directly or via *_env).")
+        client = JamfClient(url, username, password, token=token,
+                            verify_ssl=verify_ssl and entry.get("verify_ssl", True) is not False)
+        max_concurrency = number(entry, "max_concurrency", int, f"Tenant '{name}'")
+        tenants.append(Tenant(
+            name=name,
+            client=client,
+            max_concurrency=max_concurrency or THREADS,
+            rate_limit=number(entry, "rate_limit", float, f"Tenant '{name}'"),
+        ))
+    if not tenants:
+        raise ValueError(f"No tenants defined in {path}.")
+    names = [t.name for t in tenants]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Tenant names in {path} must be unique.")
+    return tenants, number(cfg, "max_workers", int, str(path))
+
+
+def scan_tenant(tenant: Tenant, include: Iterable[str], matcher, global_slots: threading.BoundedSemaphore,
+                journal: Optional[ScanJournal] = None, cancel: Optional[threading.Event] = None,
+                limit: Optional[MatchLimit] = None, priority=None) -> List[Match]:
+    """
+    Lists and scans one tenant. The tenant's own pool enforces its concurrency budget;
+    each request additionally takes a slot from the global ceiling shared by all tenants.
+
+    Listings run concurrently and their groups are fed to the pool as soon as each
+    listing arrives, with at most WINDOW_FACTOR x budget detail requests outstanding.
+    Queued groups are kept ordered by priority (a sort key; lowest first). Setting
+    cancel, or reaching limit, drops everything not yet started.
+    """
+    client = tenant.client
+    prefix = f"[{tenant.name}] " if tenant.name else ""
+    budget = max(1, tenant.max_concurrency)
+    window = WINDOW_FACTOR * budget
+    limiter = RateLimiter(tenant.rate_limit)
+
+    def throttled(fn, *fn_args):
+        # Wait out this tenant's rate limit before taking a global slot, so a slow
+        # tenant never holds slots other tenants could be using
+        limiter.wait()
+        with global_slots:
+            return fn(*fn_args)
+
+    matches: List[Match] = []
+    queue: Deque[GroupSummary] = deque()
+    resumed = 0
+    with futures.ThreadPoolExecutor(max_workers=budget) as pool:
+        # List all groups for included types
+        listings = {pool.submit(throttled, client.list_groups, gt): gt for gt in include}
+        scans: Dict[futures.Future, GroupSummary] = {}
+        try:
+            while listings or scans or queue:
+                if (cancel is not None and cancel.is_set()) or (limit is not None and limit.reached.is_set()):
+                    break
+                while queue and len(scans) < window:
+                    g = queue.popleft()
+                    scans[pool.submit(throttled, scan_group, client, g, matcher, journal)] = g
+                done, _ = futures.wait(list(listings) + list(scans), timeout=CANCEL_POLL_INTERVAL,
+                                       return_when=futures.FIRST_COMPLETED)
+                for job in done:
+                    if job in listings:
+                        gt = listings.pop(job)
+                        try:
+                            groups = job.result()
+                        except Exception as e:
+                            print(f"{prefix}ERROR listing {gt} groups: {e}", file=sys.stderr)
+                            tenant.errors += 1
+                            continue
+                        # Scan ALL groups; some Jamf versions don’t expose is_smart in the list
+                        for g in groups:
+                            g.tenant = tenant.name
+                            rec = journal.get((g.tenant, g.group_type, g.id)) if journal else None
+                            if rec is not None:
+                                found = match_criteria(g, journaled_criteria(rec), matcher)
+                                matches.extend(found)
+                                if limit is not None:
+                                    limit.add(len(found))
+                                resumed += 1
+                            else:
+                                queue.append(g)
+                        if priority is not None:
+                            queue = deque(sorted(queue, key=priority))
+                    else:
+                        scans.pop(job)
+                        try:
+                            found = job.result()
+                        except Exception as e:
+                            print(f"{prefix}ERROR scanning group: {e}", file=sys.stderr)
+                            tenant.errors += 1
+                            continue
+                        matches.extend(found)
+                        if limit is not None:
+                            limit.add(len(found))
+        finally:
+            # Only work that hasn't started is cancelled; in-flight requests finish within DEFAULT_TIMEOUT
+            for job in list(listings) + list(scans):
+                job.cancel()
+    if resumed:
+        print(f"{prefix}Resumed {resumed} groups from journal", file=sys.stderr)
+    return matches
+
+
 # ---------- Output Helpers ----------
 
 def to_json(matches: List[Match]) -> str:
     payload = []
     for m in matches:
-        payload.append({
+        item = {
             "group_type": m.group_type,
             "group_id": m.group_id,
             "group_name": m.group_name,
@@ -286,7 +651,10 @@ def to_json(matches: List[Match]) -> str:
                 "value": m.criterion.value,
                 "and_or": m.criterion.and_or,
             }
-        })
+        }
+        if m.tenant is not None:
+            item = {"tenant": m.tenant, **item}
+        payload.append(item)
     return json.dumps(payload, indent=2, sort_keys=False)
 
 
@@ -295,16 +663,17 @@ def print_table(matches: List[Match]) -> None:
         print("No matches found.")
         return
     # Pretty, multi-line grouped output
-    by_group: Dict[Tuple[str, int, str], List[Match]] = {}
+    by_group: Dict[Tuple[str, str, int, str], List[Match]] = {}
     for m in matches:
-        key = (m.group_type, m.group_id, m.group_name)
+        key = (m.tenant or "", m.group_type, m.group_id, m.group_name)
         by_group.setdefault(key, []).append(m)
 
-    def label(gt: str) -> str:
-        return {"computer": "Computer SG", "mobile": "Mobile SG", "user": "User SG"}.get(gt, gt)
+    def label(tenant: str, gt: str) -> str:
+        gt_label = {"computer": "Computer SG", "mobile": "Mobile SG", "user": "User SG"}.get(gt, gt)
+        return f"{tenant} / {gt_label}" if tenant else gt_label
 
-    for (gt, gid, gname), rows in sorted(by_group.items(), key=lambda x: (x[0][0], x[0][2].lower())):
-        print(f"\n[{label(gt)}] {gname} (id={gid})")
+    for (tenant, gt, gid, gname), rows in sorted(by_group.items(), key=lambda x: (x[0][0], x[0][1], x[0][3].lower())):
+        print(f"\n[{label(tenant, gt)}] {gname} (id={gid})")
         print("  Matches:")
         for m in rows:
             c = m.criterion
@@ -318,7 +687,10 @@ def print_table(matches: List[Match]) -> None:
 
 def main():
     parser = argparse.ArgumentParser(description="Search Jamf Smart Group criteria for a given string/regex.")
-    parser.add_argument("--url", required=True, help="Base Jamf Pro URL, e.g., https://yourorg.jamfcloud.com")
+    parser.add_argument("--url", help="Base Jamf Pro URL, e.g., https://yourorg.jamfcloud.com")
+    parser.add_argument("--tenants", help="JSON config listing several tenants to scan in parallel (instead of --url)")
+    parser.add_argument("--max-workers", type=int,
+                        help=f"Global ceiling on concurrent requests across all tenants (default: {THREADS})")
     parser.add_argument("--user", help="Jamf API username (or set JAMF_USER)")
     parser.add_argument("--password", help="Jamf API password (or set JAMF_PASS)")
     parser.add_argument("--token", help="Pre-existing bearer token (alternatively, use --user/--password)")
@@ -329,45 +701,116 @@ def main():
     parser.add_argument("--include", nargs="*", choices=GROUP_TYPES, default=list(GROUP_TYPES),
                         help="Group types to include (default: computer mobile user)")
     parser.add_argument("--json", action="store_true", help="Output JSON instead of a text table")
-    parser.add_argument("--no-verify-ssl", action="store_true", help="Disable TLS cert verification (not recommended)")
+    parser.add_argument("--no-verify-ssl", action="store_true",
+                        help="Disable TLS cert verification for every tenant (not recommended)")
+    parser.add_argument("--journal", help="Append each scanned group's criteria to this JSON-lines progress journal")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip groups already recorded in --journal and merge their earlier results")
+    parser.add_argument("--limit", type=int, help="Stop after N matches and cancel the remaining fetches")
+    parser.add_argument("--exists", action="store_true",
+                        help="Only answer whether any group matches (prints yes/no/unknown; exit status 0/1/2)")
+    parser.add_argument("--history", help="JSON file of past hits used to scan likely groups first (updated after each run)")
 
     args = parser.parse_args()
 
-    username = args.user or os.getenv("JAMF_USER")
-    password = args.password or os.getenv("JAMF_PASS")
-    token = args.token or os.getenv("JAMF_TOKEN")
+    if args.resume and not args.journal:
+        parser.error("--resume requires --journal.")
+    if args.limit is not None and args.limit < 1:
+        parser.error("--limit must be at least 1.")
+    max_matches = 1 if args.exists else args.limit
 
-    if not token and not (username and password):
-        parser.error("Provide --token OR --user/--password (or set JAMF_TOKEN / JAMF_USER / JAMF_PASS).")
+    if args.tenants:
+        if args.url:
+            parser.error("Use either --url or --tenants, not both.")
+        try:
+            tenants, cfg_workers = load_tenants(args.tenants, verify_ssl=not args.no_verify_ssl)
+        except (OSError, ValueError) as e:
+            parser.error(f"Invalid --tenants config: {e}")
+    else:
+        if not args.url:
+            parser.error("Provide --url (or --tenants).")
+        username = args.user or os.getenv("JAMF_USER")
+        password = args.password or os.getenv("JAMF_PASS")
+        token = args.token or os.getenv("JAMF_TOKEN")
 
-    client = JamfClient(args.url, username, password, token=token, verify_ssl=not args.no_verify_ssl)
-    matcher = build_matcher(args.pattern, args.regex, args.case_insensitive)
+        if not token and not (username and password):
+            parser.error("Provide --token OR --user/--password (or set JAMF_TOKEN / JAMF_USER / JAMF_PASS).")
 
-    # List all groups for included types
-    all_groups: List[GroupSummary] = []
-    for gt in args.include:
-        try:
-            all_groups.extend(client.list_groups(gt))
-        except Exception as e:
-            print(f"ERROR listing {gt} groups: {e}", file=sys.stderr)
+        client = JamfClient(args.url, username, password, token=token, verify_ssl=not args.no_verify_ssl)
+        tenants, cfg_workers = [Tenant(name=None, client=client)], None
 
-    # Scan ALL groups; some Jamf versions don’t expose is_smart in the list
-    candidates = all_groups
+    matcher = build_matcher(args.pattern, args.regex, args.case_insensitive)
+    history = load_history(args.history)
+    priority = build_priority(args.pattern, matcher, history)
+    limit = MatchLimit(max_matches)
+    global_slots = threading.BoundedSemaphore(max(1, args.max_workers or cfg_workers or THREADS))
+    journal = None
+    if args.journal:
+        try:
+            journal = ScanJournal(args.journal, journal_key, resume=args.resume,
+                                  header=journal_header(tenants, args.include))
+        except (OSError, ValueError) as e:
+            parser.error(f"Cannot use --journal: {e}")
 
+    cancel = threading.Event()
     matches: List[Match] = []
-    with futures.ThreadPoolExecutor(max_workers=THREADS) as pool:
-        jobs = [pool.submit(scan_group, client, g, matcher) for g in candidates]
-        for job in futures.as_completed(jobs):
+    try:
+        with futures.ThreadPoolExecutor(max_workers=len(tenants)) as tenant_pool:
+            jobs = {tenant_pool.submit(scan_tenant, t, args.include, matcher, global_slots, journal, cancel,
+                                       limit, priority): t
+                    for t in tenants}
             try:
-                matches.extend(job.result())
-            except Exception as e:
-                print(f"ERROR scanning group: {e}", file=sys.stderr)
+                for job in futures.as_completed(jobs):
+                    t = jobs[job]
+                    try:
+                        tenant_matches = job.result()
+                    except Exception as e:
+                        print(f"ERROR scanning tenant {t.name or t.client.base}: {e}", file=sys.stderr)
+                        t.errors += 1
+                        continue
+                    if max_matches is not None:
+                        # In-flight requests may finish after the limit is hit; drop the surplus
+                        tenant_matches = tenant_matches[:max(0, max_matches - len(matches))]
+                    matches.extend(tenant_matches)
+                    # Print each tenant as soon as it finishes so a slow one doesn't hold up the rest
+                    if not args.json and not args.exists and len(tenants) > 1:
+                        print(f"\n===== {t.name}: {len(tenant_matches)} match(es) =====")
+                        print_table(tenant_matches)
+            except KeyboardInterrupt:
+                # Must be set before the pool's shutdown waits on the tenant threads
+                cancel.set()
+                print("\nInterrupted; cancelling outstanding requests...", file=sys.stderr)
+    finally:
+        if journal:
+            journal.close()
+    if cancel.is_set():
+        if journal:
+            print(f"Progress saved to {args.journal}; rerun with --resume to continue.", file=sys.stderr)
+        sys.exit(130)
+    if args.history:
+        save_history(args.history, history, matches)
+
+    # A short answer only means "not there" if every listing and group was actually fetched
+    errors = sum(t.errors for t in tenants)
+    incomplete = bool(errors) and (max_matches is None or len(matches) < max_matches)
 
     # Output
+    if args.exists:
+        exists = True if matches else (None if incomplete else False)
+        if args.json:
+            print(json.dumps({"exists": exists, "match": json.loads(to_json(matches[:1]))[0] if matches else None,
+                              "errors": errors}, indent=2))
+        else:
+            print({True: "yes", False: "no", None: "unknown"}[exists])
+        sys.exit({True: 0, False: 1, None: 2}[exists])
     if args.json:
         print(to_json(matches))
-    else:
+    elif len(tenants) == 1:
         print_table(matches)
+    if incomplete and args.limit is not None:
+        print(f"WARNING: found {len(matches)} of --limit {args.limit} match(es), but {errors} fetch(es) failed; "
+              "there may be more.", file=sys.stderr)
+        sys.exit(2)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Send one MDM command to many devices and track it until every device answers.
+
+- Any commandType (DEVICE_LOCK, ERASE_DEVICE, RESTART_DEVICE, ...)
+- managementIds are chunked into multi-clientData POST /api/v2/mdm/commands requests
+- Chunks are sent with bounded concurrency; a chunk rejected with a 4xx is split in
+  half until the offending devices are isolated
+- Command status is polled in batches (GET /api/v2/mdm/commands?filter=uuid=in=(...))
+  with backoff until every device is acknowledged, failed, or the wait times out
+- Output: live summary line, final per-device table, optional JSON report
+- Exit status 1 if any device failed, timed out, or was never given a command id
+
+Usage examples:
+  export CLIENT_ID="<client ID>" CLIENT_SECRET="<client secret>"
+
+  python mdm_dispatch.py RESTART_DEVICE --ids lab_management_ids.txt --report restart.json
+
+  python mdm_dispatch.py DEVICE_LOCK --ids lost.txt --pin 123456 \
+    --message "Please return this computer to the helpdesk"
+
+  python mdm_dispatch.py ERASE_DEVICE --ids retire.txt --pin 123456 \
+    --command-data '{"obliterationBehavior": "DoNotObliterate"}'
+
+Requires: Python 3.8+, jps-api-wrapper (pip3 install jps-api-wrapper)
+"""
+
+import argparse
+import concurrent.futures as futures
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+
+# ---------- Configuration / Constants ----------
+
+COMMANDS_PATH = "/api/v2/mdm/commands"
+CLIENT_TYPES = ("COMPUTER", "MOBILE_DEVICE", "USER")
+
+CHUNK_SIZE = 100        # clientData entries per POST
+POLL_BATCH = 50         # command uuids per status GET (keeps the filter URL short)
+THREADS = 4
+POLL_INITIAL_DELAY = 2.0
+POLL_MAX_DELAY = 30.0
+POLL_BACKOFF = 1.5
+DEFAULT_WAIT = 600      # seconds to keep polling before giving up on pending devices
+
+# Rejections that say nothing about individual devices, so splitting the chunk can't help
+UNSPLITTABLE_STATUSES = (401, 403, 429)
+
+# Jamf commandState values that end tracking for a device
+DONE_STATES = {"ACKNOWLEDGED": "acknowledged", "ERROR": "failed", "COMMAND_FORMAT_ERROR": "failed"}
+
+
+# ---------- Dataclasses ----------
+
+@dataclass
+class DeviceCommand:
+    management_id: str
+    client_type: str
+    command_uuid: Optional[str] = None
+    state: str = "queued"   # queued -> pending -> acknowledged | failed | timed out
+    detail: Optional[str] = None
+
+
+# ---------- Payloads ----------
+
+def build_command_payload(command_type: str, client_data: Iterable[Dict[str, str]],
+                          command_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Body for POST /api/v2/mdm/commands; command_data holds the command-specific fields (pin, message, ...)."""
+    data = {"commandType": command_type}
+    data.update({k: v for k, v in (command_data or {}).items() if v is not None})
+    return {"commandData": data, "clientData": list(client_data)}
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterable[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _json_or_raw(r) -> Any:
+    try:
+        return r.json()
+    except ValueError:
+        return {"raw": r.text}
+
+
+# ---------- Dispatcher ----------
+
+class MdmDispatcher:
+    """
+    Works with any requests-style session that already carries Jamf auth,
+    e.g. jps_api_wrapper's Pro.session or JamfClient.session.
+    """
+
+    def __init__(self, session, base_url: str, chunk_size: int = CHUNK_SIZE, max_workers: int = THREADS):
+        self.session = session
+        self.base = base_url.rstrip("/")
+        self.chunk_size = max(1, chunk_size)
+        self.max_workers = max(1, max_workers)
+
+    # ---- Sending ----
+    def _post_chunk(self, command_type: str, devices: Sequence[DeviceCommand],
+                    command_data: Optional[Dict[str, Any]]):
+        payload = build_command_payload(
+            command_type,
+            ({"managementId": d.management_id, "clientType": d.client_type} for d in devices),
+            command_data,
+        )
+        r = self.session.post(
+            f"{self.base}{COMMANDS_PATH}",
+            json=payload,
+            headers={"Accept": "application/json", "Content-Type": "application/json"},
+        )
+        return r.status_code, _json_or_raw(r)
+
+    def _send_chunk(self, command_type: str, devices: Sequence[DeviceCommand],
+                    command_data: Optional[Dict[str, Any]]) -> None:
+        """
+        POSTs one chunk. A 4xx rejection is bisected so a single bad managementId
+        (unknown, wrong clientType, ...) doesn't fail its neighbours. A request
+        error only fails the devices of this call, never ones already sent.
+        """
+        try:
+            status, body = self._post_chunk(command_type, devices, command_data)
+        except Exception as e:
+            for d in devices:
+                d.state, d.detail = "failed", f"{type(e).__name__}: {e}"
+            return
+        if 400 <= status < 500 and status not in UNSPLITTABLE_STATUSES and len(devices) > 1:
+            print(f"\nChunk of {len(devices)} rejected ({status}); splitting", file=sys.stderr)
+            rejection = f"HTTP {status}: {body}"
+            probes, rest = (devices[0], devices[-1]), devices[1:-1]
+            for d in probes:
+                self._send_chunk(command_type, [d], command_data)
+            if all(d.state == "failed" and d.detail == rejection for d in probes):
+                # Two different devices alone got the chunk's exact rejection: the payload
+                # itself is bad (e.g. DEVICE_LOCK without pin), so splitting can't help
+                for d in rest:
+                    d.state, d.detail = "failed", rejection
+                return
+            mid = len(rest) // 2
+            for part in (rest[:mid], rest[mid:]):
+                if part:
+                    self._send_chunk(command_type, part, command_data)
+            return
+        if status >= 400:
+            for d in devices:
+                d.state, d.detail = "failed", f"HTTP {status}: {body}"
+            return
+        # 201 returns one {"id", "href"} per clientData entry, in request order
+        created = body if isinstance(body, list) else []
+        for d, item in zip(devices, created):
+            d.command_uuid = item.get("id") if isinstance(item, dict) else None
+            d.state = "pending"
+        for d in devices[len(created):]:
+            d.state, d.detail = "pending", "no command id returned; status unknown"
+
+    def send(self, command_type: str, devices: List[DeviceCommand],
+             command_data: Optional[Dict[str, Any]] = None) -> None:
+        with futures.ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            jobs = {pool.submit(self._send_chunk, command_type, chunk, command_data): chunk
+                    for chunk in _chunks(devices, self.chunk_size)}
+            for job in futures.as_completed(jobs):
+                try:
+                    job.result()
+                except Exception as e:
+                    # Devices that already got a command id must not be reported as failed
+                    for d in jobs[job]:
+                        if d.state == "queued":
+                            d.state, d.detail = "failed", f"{type(e).__name__}: {e}"
+
+    # ---- Tracking ----
+    def _poll_batch(self, devices: Sequence[DeviceCommand]) -> None:
+        by_uuid = {d.command_uuid: d for d in devices}
+        r = self.session.get(
+            f"{self.base}{COMMANDS_PATH}",
+            params={
+                "filter": f"uuid=in=({','.join(by_uuid)})",
+                "page": 0,
+                "page-size": len(by_uuid),
+            },
+            headers={"Accept": "application/json"},
+        )
+        r.raise_for_status()
+        for item in r.json().get("results", []):
+            d = by_uuid.get(item.get("uuid"))
+            if d is None:
+                continue
+            state = str(item.get("commandState") or "").upper()
+            if state in DONE_STATES:
+                d.state = DONE_STATES[state]
+                d.detail = item.get("dateCompleted") or state
+
+    def track(self, devices: List[DeviceCommand], max_wait: float = DEFAULT_WAIT, progress=None) -> None:
+        deadline = time.monotonic() + max_wait
+        delay = POLL_INITIAL_DELAY
+        while True:
+            waiting = [d for d in devices if d.state == "pending" and d.command_uuid]
+            if progress:
+                progress(devices)
+            if not waiting:
+                return
+            if time.monotonic() >= deadline:
+                for d in waiting:
+                    d.state = "timed out"
+                if progress:
+                    progress(devices)
+                return
+            time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
+            with futures.ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                jobs = [pool.submit(self._poll_batch, batch) for batch in _chunks(waiting, POLL_BATCH)]
+                for job in futures.as_completed(jobs):
+                    try:
+                        job.result()
+                    except Exception as e:
+                        # Transient status errors just mean another round of polling
+                        print(f"\nWARNING: status poll failed: {e}", file=sys.stderr)
+
+    def run(self, command_type: str, devices: List[DeviceCommand], command_data: Optional[Dict[str, Any]] = None,
+            max_wait: float = DEFAULT_WAIT, progress=None) -> List[DeviceCommand]:
+        self.send(command_type, devices, command_data)
+        if max_wait > 0:
+            self.track(devices, max_wait=max_wait, progress=progress)
+        return devices
+
+
+# ---------- Output Helpers ----------
+
+def unresolved(devices: Iterable[DeviceCommand]) -> List[DeviceCommand]:
+    """Devices that failed, timed out, or were never confirmed (pending without a command id)."""
+    return [d for d in devices
+            if d.state in ("failed", "timed out", "queued") or (d.state == "pending" and not d.command_uuid)]
+
+
+def summarize(devices: Iterable[DeviceCommand]) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for d in devices:
+        counts[d.state] = counts.get(d.state, 0) + 1
+    return counts
+
+
+def live_summary(devices: List[DeviceCommand]) -> None:
+    counts = summarize(devices)
+    states = " | ".join(f"{state}: {n}" for state, n in sorted(counts.items()))
+    line = f"[{time.strftime('%H:%M:%S')}] {len(devices)} devices | {states}"
+    # Rewrite one status line on a terminal; plain lines when redirected
+    if sys.stderr.isatty():
+        print(f"\r{line}\033[K", end="", file=sys.stderr, flush=True)
+    else:
+        print(line, file=sys.stderr)
+
+
+def print_table(devices: List[DeviceCommand]) -> None:
+    if sys.stderr.isatty():
+        print(file=sys.stderr)
+    for d in devices:
+        line = f"  {d.management_id}  {d.client_type:<13}  {d.state}"
+        if d.detail:
+            line += f" ({d.detail})"
+        print(line)
+    print("\n" + ", ".join(f"{n} {state}" for state, n in sorted(summarize(devices).items())))
+
+
+def write_report(path: str, command_type: str, devices: List[DeviceCommand]) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({
+            "command_type": command_type,
+            "summary": summarize(devices),
+            "devices": [asdict(d) for d in devices],
+        }, fh, indent=2)
+        fh.write("\n")
+
+
+def read_targets(path: str, default_client_type: str) -> List[DeviceCommand]:
+    """One managementId per line, optionally followed by ',CLIENT_TYPE'. '#' starts a comment."""
+    devices: List[DeviceCommand] = []
+    seen = set()
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            mid, _, ctype = (part.strip() for part in line.partition(","))
+            ctype = (ctype or default_client_type).upper()
+            if ctype not in CLIENT_TYPES:
+                raise ValueError(f"Unknown client type '{ctype}' for {mid}")
+            if mid not in seen:
+                seen.add(mid)
+                devices.append(DeviceCommand(management_id=mid, client_type=ctype))
+    return devices
+
+
+# ---------- Main ----------
+
+def main():
+    parser = argparse.ArgumentParser(description="Jamf: send an MDM command to many devices and track completion.")
+    parser.add_argument("command_type", help="MDM commandType, e.g. DEVICE_LOCK, ERASE_DEVICE, RESTART_DEVICE")
+    parser.add_argument("--ids", required=True, help="File of managementIds (optionally 'id,CLIENT_TYPE' per line)")
+    parser.add_argument("--client-type", choices=CLIENT_TYPES, default="COMPUTER",
+                        help="clientType for ids without one (default: COMPUTER)")
+    parser.add_argument("--pin", help="6-digit PIN (DEVICE_LOCK / ERASE_DEVICE)")
+    parser.add_argument("-m", "--message", help="Optional lock message")
+    parser.add_argument("--command-data", help="Extra commandData fields as a JSON object")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help=f"Devices per request (default: {CHUNK_SIZE})")
+    parser.add_argument("--max-workers", type=int, default=THREADS, help=f"Concurrent requests (default: {THREADS})")
+    parser.add_argument("--wait", type=float, default=DEFAULT_WAIT,
+                        help=f"Seconds to poll for completion, 0 to fire and forget (default: {DEFAULT_WAIT})")
+    parser.add_argument("--report", help="Write a JSON report of every device's final state to this path")
+    args = parser.parse_args()
+
+    command_data: Dict[str, Any] = {}
+    if args.command_data:
+        try:
+            command_data = json.loads(args.command_data)
+        except json.JSONDecodeError as e:
+            parser.error(f"--command-data is not valid JSON: {e}")
+        if not isinstance(command_data, dict):
+            parser.error("--command-data must be a JSON object.")
+    if args.pin is not None:
+        if not (args.pin.isdigit() and len(args.pin) == 6):
+            parser.error("--pin must be exactly 6 digits.")
+        command_data["pin"] = args.pin
+    if args.message is not None:
+        command_data["message"] = args.message
+
+    try:
+        devices = read_targets(args.ids, args.client_type)
+    except (OSError, ValueError) as e:
+        parser.error(f"Cannot read --ids: {e}")
+    if not devices:
+        parser.error("No managementIds found in --ids file.")
+
+    jps_url = os.environ.get("JPS_URL", "https://punahou.jamfcloud.com")
+    client_id = os.environ.get("CLIENT_ID")
+    client_secret = os.environ.get("CLIENT_SECRET")
+    if not client_id or not client_secret:
+        print("ERROR: Set CLIENT_ID and CLIENT_SECRET environment variables.", file=sys.stderr)
+        sys.exit(2)
+
+    # Deferred so argument errors don't pay for loading the HTTP stack
+    from jps_api_wrapper.pro import Pro
+
+    command_type = args.command_type.upper()
+    with Pro(jps_url, client_id, client_secret, client=True) as pro:
+        dispatcher = MdmDispatcher(pro.session, pro.base_url, chunk_size=args.chunk_size, max_workers=args.max_workers)
+        dispatcher.run(command_type, devices, command_data, max_wait=args.wait, progress=live_summary)
+
+    print_table(devices)
+    if args.report:
+        write_report(args.report, command_type, devices)
+    if unresolved(devices):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,18 @@
 Export criteria for ALL Computer Smart Groups using jamf-pro-sdk Classic API (tested with 0.8a1).
 
 Auth: OAuth client credentials only (client_id/client_secret).
+Resume: --journal records each exported group; --resume skips groups already in it.
+Output: indented JSON on stdout (default), or --format parquet|arrow --output FILE to
+stream one row per criterion into a columnar file (needs pyarrow).
 """
 
 import argparse
 import json
 import sys
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
-from jamf_pro_sdk import JamfProClient, ApiClientCredentialsProvider
+from criteria_snapshot import FORMATS, CriteriaRowWriter, criteria_hash, require_pyarrow
+from scan_journal import ScanJournal
 
 # -------------------- attribute-safe access helpers --------------------
 
@@ -117,7 +121,14 @@ def _extract_criteria(detail: Any) -> List[Dict[str, Any]]:
 
 # -------------------- core logic --------------------
 
-def list_smart_computer_group_criteria(server: str, client_id: str, client_secret: str) -> List[Dict[str, Any]]:
+def _journal_key(rec: Dict[str, Any]) -> int:
+    return int(rec["id"])
+
+def iter_smart_computer_group_criteria(server: str, client_id: str, client_secret: str,
+                                       journal: Optional[ScanJournal] = None) -> Iterator[Dict[str, Any]]:
+    # Imported here: jamf_pro_sdk pulls in pydantic, which --help and usage errors don't need
+    from jamf_pro_sdk import JamfProClient, ApiClientCredentialsProvider
+
     client = JamfProClient(
         server=server,
         credentials=ApiClientCredentialsProvider(client_id, client_secret),
@@ -136,7 +147,6 @@ def list_smart_computer_group_criteria(server: str, client_id: str, client_secre
         else:
             groups = []
 
-    results: List[Dict[str, Any]] = []
     for g in groups:
         if not _is_smart(g):
             continue
@@ -145,6 +155,11 @@ def list_smart_computer_group_criteria(server: str, client_id: str, client_secre
         if gid is None:
             continue
 
+        done = journal.get(gid) if journal else None
+        if done is not None:
+            yield done
+            continue
+
         # 2) Fetch detail. Some SDK builds/servers need 'view=full' to include criteria.
         try:
             detail = client.classic_api.get_computer_group_by_id(gid, view="full")  # try full view
@@ -154,14 +169,20 @@ def list_smart_computer_group_criteria(server: str, client_id: str, client_secre
 
         crit = _extract_criteria(detail)
 
-        results.append({
+        rec = {
             "id": gid,
             "name": _group_name(g),
             "site": _group_site(g),
             "criteria": crit,
-        })
+            "criteria_hash": criteria_hash(crit),
+        }
+        if journal:
+            journal.record(rec)
+        yield rec
 
-    return results
+def list_smart_computer_group_criteria(server: str, client_id: str, client_secret: str,
+                                       journal: Optional[ScanJournal] = None) -> List[Dict[str, Any]]:
+    return list(iter_smart_computer_group_criteria(server, client_id, client_secret, journal=journal))
 
 # -------------------- CLI --------------------
 
@@ -170,11 +191,45 @@ def main():
     ap.add_argument("--server", required=True, help="Jamf Pro server domain (no protocol), e.g. yourtenant.jamfcloud.com")
     ap.add_argument("--client-id", required=True, help="Jamf Pro API Client ID")
     ap.add_argument("--client-secret", required=True, help="Jamf Pro API Client Secret")
+    ap.add_argument("--journal", help="Append each exported group to this JSON-lines progress journal")
+    ap.add_argument("--resume", action="store_true", help="Skip groups already recorded in --journal")
+    ap.add_argument("--format", choices=FORMATS, default="json", help="Output format (default: json)")
+    ap.add_argument("--output", help="Output file (required for parquet/arrow; JSON goes to stdout if omitted)")
     args = ap.parse_args()
+    if args.resume and not args.journal:
+        ap.error("--resume requires --journal.")
+    if args.format != "json" and not args.output:
+        ap.error(f"--format {args.format} requires --output.")
+    if args.format != "json":
+        try:
+            require_pyarrow()  # fail before the crawl, not after it
+        except RuntimeError as e:
+            ap.error(str(e))
 
-    data = list_smart_computer_group_criteria(args.server, args.client_id, args.client_secret)
-    json.dump(data, sys.stdout, indent=2)
-    sys.stdout.write("\n")
+    journal = None
+    if args.journal:
+        try:
+            journal = ScanJournal(args.journal, _journal_key, resume=args.resume,
+                                  header={"server": args.server.rstrip("/"), "group_types": ["computer"]})
+        except (OSError, ValueError) as e:
+            ap.error(f"Cannot use --journal: {e}")
+    try:
+        groups = iter_smart_computer_group_criteria(args.server, args.client_id, args.client_secret, journal=journal)
+        if args.format == "json":
+            data = list(groups)
+            out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+            json.dump(data, out, indent=2)
+            out.write("\n")
+            if out is not sys.stdout:
+                out.close()
+        else:
+            with CriteriaRowWriter(args.output, args.format) as writer:
+                for rec in groups:
+                    writer.add_group(rec["id"], "computer", rec["name"], rec["site"], rec["criteria"])
+            print(f"Wrote {writer.rows_written} rows to {args.output}", file=sys.stderr)
+    finally:
+        if journal:
+            journal.close()
 
 if __name__ == "__main__":
     main()
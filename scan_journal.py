@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Append-only progress journal for long smart group scans.
+
+Each completed group is written as one JSON line (group identity + parsed
+criteria) and flushed immediately, so a crawl that dies part way through
+(network blip, expired token, laptop sleep) can be restarted with --resume and
+only fetch the groups that are not in the journal yet.
+
+The first line is a header record ({"journal": {...}}) describing what was
+scanned (server URL, group types). --resume refuses a journal whose header
+doesn't match the current run, so one instance's groups are never merged into
+another's results. Readers of journal files skip it with is_header().
+
+Used by jamf_smart_group_grep.py and reportSmartGroupCriteria.py.
+
+Requires: Python 3.8+
+"""
+
+import json
+import os
+import sys
+import threading
+from typing import Any, Dict, Hashable, Iterator, Optional
+
+
+HEADER_KEY = "journal"
+
+
+def is_header(rec: Any) -> bool:
+    return isinstance(rec, dict) and HEADER_KEY in rec
+
+
+class ScanJournal:
+    """
+    Thread-safe JSON-lines journal keyed by a caller-supplied key function.
+
+    Records are plain dicts; key_func maps a record to a hashable identity
+    (e.g. (group_type, group_id)) used to decide what is already done.
+    """
+
+    def __init__(self, path: str, key_func, resume: bool = False, header: Optional[Dict[str, Any]] = None):
+        self.path = path
+        self.key_func = key_func
+        self._lock = threading.Lock()
+        self.completed: Dict[Hashable, Dict[str, Any]] = {}
+        # Compare in JSON form so tuples vs lists etc. don't cause false mismatches
+        header = json.loads(json.dumps(header, default=str)) if header is not None else None
+        if resume:
+            self._drop_partial_tail(path)
+            stored, records = None, []
+            for rec in self._read(path):
+                if is_header(rec):
+                    stored = stored or rec[HEADER_KEY]
+                else:
+                    records.append(rec)
+            if header is not None and (stored or records) and stored != header:
+                if stored is None:
+                    raise ValueError(f"{path} has no header saying which server it came from; "
+                                     "start a new journal instead of resuming.")
+                raise ValueError(f"{path} was written for {json.dumps(stored)}, not {json.dumps(header)}; "
+                                 "refusing to resume.")
+            self.completed = {self.key_func(rec): rec for rec in records}
+            self._fh = open(path, "a", encoding="utf-8")
+            if header is not None and stored is None:
+                self._write({HEADER_KEY: header})
+        else:
+            # Fresh scan: start a new journal rather than appending to a stale one
+            self._fh = open(path, "w", encoding="utf-8")
+            if header is not None:
+                self._write({HEADER_KEY: header})
+
+    @staticmethod
+    def _drop_partial_tail(path: str) -> None:
+        """
+        A crash mid-write leaves a last line without its newline. Cut the file back to
+        the last complete line so the next record doesn't get glued onto the fragment;
+        that group is simply redone.
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, "rb+") as fh:
+            fh.seek(0, os.SEEK_END)
+            size = fh.tell()
+            if not size:
+                return
+            fh.seek(size - 1)
+            if fh.read(1) == b"\n":
+                return
+            # Walk back in blocks to the last newline
+            pos = size
+            while pos > 0:
+                start = max(0, pos - 65536)
+                fh.seek(start)
+                nl = fh.read(pos - start).rfind(b"\n")
+                if nl != -1:
+                    pos = start + nl + 1
+                    break
+                pos = start
+            fh.truncate(pos)
+        print(f"WARNING: dropped incomplete last record in {path}", file=sys.stderr)
+
+    @staticmethod
+    def _read(path: str) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as fh:
+            for lineno, line in enumerate(fh, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    print(f"WARNING: skipping unreadable journal line {lineno} in {path}", file=sys.stderr)
+
+    def _write(self, rec: Dict[str, Any]) -> None:
+        self._fh.write(json.dumps(rec, separators=(",", ":"), default=str) + "\n")
+        self._fh.flush()
+
+    def record(self, rec: Dict[str, Any]) -> None:
+        with self._lock:
+            self._write(rec)
+            self.completed[self.key_func(rec)] = rec
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        return self.completed.get(key)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+
+    def __enter__(self) -> "ScanJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -2,10 +2,9 @@
 import argparse
 import json
 import sys
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from jamf_pro_sdk import JamfProClient, ApiClientCredentialsProvider
-from jamf_pro_sdk.clients.pro_api.pagination import Paginator
+from criteria_snapshot import FORMATS, CriteriaRowWriter, require_pyarrow
 
 def _results_list(resp: Union[Dict[str, Any], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
     """
@@ -18,41 +17,85 @@ def _results_list(resp: Union[Dict[str, Any], List[Dict[str, Any]]]) -> List[Dic
         return resp
     return []
 
-def get_smart_groups(server: str, client_id: str, client_secret: str) -> Dict[str, List[Dict[str, Any]]]:
-    client = JamfProClient(
+GROUP_RESOURCES = (("computer", "v1/computer-groups"), ("mobile", "v1/mobile-device-groups"))
+JSON_KEYS = {"computer": "smartComputerGroups", "mobile": "smartMobileDeviceGroups"}
+
+def _pro_client(server: str, client_id: str, client_secret: str):
+    # Imported here: jamf_pro_sdk pulls in pydantic, which --help and usage errors don't need
+    from jamf_pro_sdk import JamfProClient, ApiClientCredentialsProvider
+
+    return JamfProClient(
         server=server,
         credentials=ApiClientCredentialsProvider(client_id, client_secret),
     )
 
-    # NOTE: Paginator in 0.8a1 requires return_model; use None for raw JSON.
-    comp_resp = Paginator(
-        api_client=client.pro_api,
-        resource_path="v1/computer-groups",
-        return_model=None,
-    )(return_generator=False)
+def _site(group: Dict[str, Any]) -> Optional[str]:
+    # Site *name*, as reportSmartGroupCriteria.py writes it; a bare siteId (-1 = none) is left out
+    site = group.get("site")
+    if isinstance(site, dict):
+        return site.get("name")
+    return None
 
-    mobile_resp = Paginator(
-        api_client=client.pro_api,
-        resource_path="v1/mobile-device-groups",
-        return_model=None,
-    )(return_generator=False)
+def iter_smart_group_pages(server: str, client_id: str, client_secret: str) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Yields (group_type, smart groups on one page) as each page arrives, so a
+    columnar export never holds more than one page of groups in memory.
+    """
+    from jamf_pro_sdk.clients.pro_api.pagination import Paginator
+
+    client = _pro_client(server, client_id, client_secret)
+    for group_type, resource_path in GROUP_RESOURCES:
+        # NOTE: Paginator in 0.8a1 requires return_model; use None for raw JSON.
+        pages = Paginator(
+            api_client=client.pro_api,
+            resource_path=resource_path,
+            return_model=None,
+        )(return_generator=True)
+        for page in pages:
+            results = _results_list(getattr(page, "results", page))
+            yield group_type, [g for g in results if g.get("isSmart") is True]
 
-    comp_groups = [g for g in _results_list(comp_resp) if g.get("isSmart") is True]
-    mobile_groups = [g for g in _results_list(mobile_resp) if g.get("isSmart") is True]
+def get_smart_groups(server: str, client_id: str, client_secret: str) -> Dict[str, List[Dict[str, Any]]]:
+    data: Dict[str, List[Dict[str, Any]]] = {key: [] for key in JSON_KEYS.values()}
+    for group_type, groups in iter_smart_group_pages(server, client_id, client_secret):
+        data[JSON_KEYS[group_type]].extend(groups)
+    return data
 
-    return {
-        "smartComputerGroups": comp_groups,
-        "smartMobileDeviceGroups": mobile_groups,
-    }
+def write_columnar(pages: Iterable[Tuple[str, List[Dict[str, Any]]]], path: str, fmt: str) -> int:
+    """One row per group (these list endpoints carry no criteria). Returns rows written."""
+    with CriteriaRowWriter(path, fmt) as writer:
+        for group_type, groups in pages:
+            for g in groups:
+                writer.add_group(int(g.get("id")), group_type, str(g.get("name", "")), _site(g), [])
+    return writer.rows_written
 
 def main():
     parser = argparse.ArgumentParser(description="List all smart groups from Jamf Pro (client credentials only).")
     parser.add_argument("--server", required=True, help="Jamf Pro server, e.g. https://yourtenant.jamfcloud.com")
     parser.add_argument("--client-id", required=True, help="Jamf Pro API Client ID")
     parser.add_argument("--client-secret", required=True, help="Jamf Pro API Client Secret")
+    parser.add_argument("--format", choices=FORMATS, default="json", help="Output format (default: json)")
+    parser.add_argument("--output", help="Output file (required for parquet/arrow)")
     args = parser.parse_args()
+    if args.format != "json" and not args.output:
+        parser.error(f"--format {args.format} requires --output.")
+    if args.format != "json":
+        try:
+            require_pyarrow()  # fail before fetching, not after
+        except RuntimeError as e:
+            parser.error(str(e))
 
+    if args.format != "json":
+        pages = iter_smart_group_pages(args.server, args.client_id, args.client_secret)
+        rows = write_columnar(pages, args.output, args.format)
+        print(f"Wrote {rows} rows to {args.output}", file=sys.stderr)
+        return
     data = get_smart_groups(args.server, args.client_id, args.client_secret)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=2)
+            fh.write("\n")
+        return
     json.dump(data, sys.stdout, indent=2)
     print()
 
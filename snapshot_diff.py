@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Report smart group criteria drift between two snapshots.
+
+- Inputs: reportSmartGroupCriteria.py output (JSON, Parquet or Arrow), or a
+  jamf_smart_group_grep.py / reportSmartGroupCriteria.py --journal file
+- Groups are compared by criteria_hash first (computed on load for older
+  snapshots without it); only groups whose hash changed are opened up
+- Per changed group: criteria added, removed, or modified (same criterion
+  name, different operator/value/and_or)
+- Output: human-readable report OR JSON; exit status 1 when anything drifted (like diff)
+
+Usage examples:
+  python reportSmartGroupCriteria.py ... --format parquet --output monday.parquet
+  python reportSmartGroupCriteria.py ... --format parquet --output tuesday.parquet
+  python snapshot_diff.py monday.parquet tuesday.parquet
+
+  python snapshot_diff.py old.json new.json --json
+
+Requires: Python 3.8+, pyarrow only for Parquet/Arrow snapshots
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+from criteria_snapshot import (CRITERION_FIELDS, GroupKey, criteria_hash, criterion_key, iter_snapshot_records,
+                               latest_records, record_name, require_pyarrow)
+
+
+# ---------- Snapshot Loading ----------
+
+class Snapshot:
+    """
+    Group hashes and names for a whole snapshot; criteria are only materialized
+    for the groups a diff actually needs to look inside.
+    """
+
+    def __init__(self, hashes: Dict[GroupKey, str], names: Dict[GroupKey, str],
+                 criteria_loader: Callable[[Iterable[GroupKey]], Dict[GroupKey, List[Dict[str, Any]]]]):
+        self.hashes = hashes
+        self.names = names
+        self._criteria_loader = criteria_loader
+
+    def criteria(self, keys: Iterable[GroupKey]) -> Dict[GroupKey, List[Dict[str, Any]]]:
+        return self._criteria_loader(keys)
+
+
+def _load_json(path: str) -> Snapshot:
+    by_key = latest_records(iter_snapshot_records(path))
+    hashes = {key: rec.get("criteria_hash") or criteria_hash(rec.get("criteria") or []) for key, rec in by_key.items()}
+    names = {key: record_name(rec) for key, rec in by_key.items()}
+    return Snapshot(hashes, names, lambda keys: {k: by_key[k].get("criteria") or [] for k in keys})
+
+
+def _load_columnar(path: str) -> Snapshot:
+    pa = require_pyarrow()
+    import pyarrow.compute as pc
+
+    if path.endswith(".parquet"):
+        table = pa.parquet.read_table(path)
+    else:
+        table = pa.ipc.open_file(path).read_all()
+
+    def decoded(t, name: str) -> list:
+        col = t.column(name)
+        if pa.types.is_dictionary(col.type):
+            col = col.cast(pa.string())
+        return col.to_pylist()
+
+    # Each group's first row (criterion_index 0, or null for a group without criteria)
+    # carries everything the hash comparison needs
+    ci = table.column("criterion_index")
+    heads = table.filter(pc.or_kleene(pc.is_null(ci), pc.equal(ci, 0)))
+    keys = [(None, gt, int(gid)) for gt, gid in zip(decoded(heads, "group_type"), heads.column("group_id").to_pylist())]
+    names = dict(zip(keys, decoded(heads, "group_name")))
+    hashes = dict(zip(keys, decoded(heads, "criteria_hash"))) if "criteria_hash" in table.column_names else None
+
+    def criteria(wanted: Iterable[GroupKey]) -> Dict[GroupKey, List[Dict[str, Any]]]:
+        wanted = set(wanted)
+        ids = pa.array(sorted({gid for _, _, gid in wanted}), type=pa.int64())
+        rows = table.filter(pc.is_in(table.column("group_id"), value_set=ids))
+        cols = {name: decoded(rows, name) for name in ("group_type", "group_id", "criterion_index") + CRITERION_FIELDS}
+        out: Dict[GroupKey, List[Dict[str, Any]]] = {k: [] for k in wanted}
+        for i, (gt, gid) in enumerate(zip(cols["group_type"], cols["group_id"])):
+            key = (None, gt, int(gid))
+            if key in out and cols["criterion_index"][i] is not None:
+                out[key].append({f: cols[f][i] for f in CRITERION_FIELDS})
+        return out
+
+    if hashes is None:
+        hashes = {key: criteria_hash(crit) for key, crit in criteria(keys).items()}
+    return Snapshot(hashes, names, criteria)
+
+
+def load_snapshot(path: str) -> Snapshot:
+    if path.endswith((".parquet", ".arrow", ".feather")):
+        return _load_columnar(path)
+    return _load_json(path)
+
+
+# ---------- Diff ----------
+
+def diff_criteria(old: List[Dict[str, Any]], new: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Multiset difference of two criteria lists; a removed + added pair with the same name is 'modified'."""
+    old_keys = Counter(criterion_key(c) for c in old)
+    new_keys = Counter(criterion_key(c) for c in new)
+    removed = list((old_keys - new_keys).elements())
+    added = list((new_keys - old_keys).elements())
+
+    def as_dict(k: Tuple[str, ...]) -> Dict[str, Any]:
+        return dict(zip(CRITERION_FIELDS, k))
+
+    modified = []
+    for r in list(removed):
+        a = next((a for a in added if a[0] == r[0]), None)
+        if a is not None:
+            removed.remove(r)
+            added.remove(a)
+            modified.append({"name": r[0], "old": as_dict(r), "new": as_dict(a)})
+    return {
+        "added": [as_dict(k) for k in added],
+        "removed": [as_dict(k) for k in removed],
+        "modified": modified,
+    }
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> Dict[str, Any]:
+    changed_keys = [k for k, digest in new.hashes.items() if k in old.hashes and old.hashes[k] != digest]
+    old_criteria = old.criteria(changed_keys) if changed_keys else {}
+    new_criteria = new.criteria(changed_keys) if changed_keys else {}
+    changed = [
+        {"key": k, "group_name": new.names.get(k, ""), **diff_criteria(old_criteria[k], new_criteria[k])}
+        for k in changed_keys
+    ]
+
+    def describe(snapshot: Snapshot, key: GroupKey) -> Dict[str, Any]:
+        return {"key": key, "group_name": snapshot.names.get(key, "")}
+
+    return {
+        "added_groups": [describe(new, k) for k in new.hashes if k not in old.hashes],
+        "removed_groups": [describe(old, k) for k in old.hashes if k not in new.hashes],
+        "changed_groups": changed,
+        "unchanged": sum(1 for k, d in new.hashes.items() if old.hashes.get(k) == d),
+    }
+
+
+# ---------- Output Helpers ----------
+
+def _key_json(key: GroupKey) -> Dict[str, Any]:
+    tenant, gt, gid = key
+    out = {"group_type": gt, "group_id": gid}
+    if tenant is not None:
+        out = {"tenant": tenant, **out}
+    return out
+
+
+def to_json(result: Dict[str, Any]) -> str:
+    def group(item: Dict[str, Any]) -> Dict[str, Any]:
+        return {**_key_json(item["key"]), **{k: v for k, v in item.items() if k != "key"}}
+
+    payload = {
+        "added_groups": [group(g) for g in result["added_groups"]],
+        "removed_groups": [group(g) for g in result["removed_groups"]],
+        "changed_groups": [group(g) for g in result["changed_groups"]],
+        "unchanged": result["unchanged"],
+    }
+    return json.dumps(payload, indent=2)
+
+
+def _fmt(c: Dict[str, Any]) -> str:
+    return f"name='{c['name']}', op='{c['search_type'] or '—'}', value='{c['value'] or '—'}', and_or='{c['and_or'] or '—'}'"
+
+
+def _label(key: GroupKey, name: str) -> str:
+    tenant, gt, gid = key
+    where = f"{tenant} / {gt}" if tenant else gt
+    return f"[{where}] {name} (id={gid})"
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    for item in result["added_groups"]:
+        print(f"+ {_label(item['key'], item['group_name'])}")
+    for item in result["removed_groups"]:
+        print(f"- {_label(item['key'], item['group_name'])}")
+    for item in result["changed_groups"]:
+        print(f"\n~ {_label(item['key'], item['group_name'])}")
+        for c in item["added"]:
+            print(f"   + {_fmt(c)}")
+        for c in item["removed"]:
+            print(f"   - {_fmt(c)}")
+        for m in item["modified"]:
+            print(f"   ~ {_fmt(m['old'])}")
+            print(f"     → {_fmt(m['new'])}")
+    print(f"\n{len(result['added_groups'])} added, {len(result['removed_groups'])} removed, "
+          f"{len(result['changed_groups'])} changed, {result['unchanged']} unchanged group(s)")
+
+
+# ---------- Main ----------
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two smart group criteria snapshots.")
+    parser.add_argument("old", help="Earlier snapshot (.json, journal .jsonl, .parquet or .arrow)")
+    parser.add_argument("new", help="Later snapshot")
+    parser.add_argument("--json", action="store_true", help="Output JSON instead of a text report")
+    args = parser.parse_args()
+
+    try:
+        old, new = load_snapshot(args.old), load_snapshot(args.new)
+    except (OSError, ValueError, KeyError, RuntimeError) as e:
+        parser.error(f"Cannot load snapshot: {e}")
+
+    result = diff_snapshots(old, new)
+    if args.json:
+        print(to_json(result))
+    else:
+        print_report(result)
+    if result["added_groups"] or result["removed_groups"] or result["changed_groups"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Add or remove many computers from a Jamf static computer group in a few requests.
+
+Python counterpart of "Assign Computer to Static Group.sh" for bulk work:
+- Reads serial numbers from a file (one per line, '#' comments allowed)
+- Diffs them against the group's current membership (Classic GET computergroups/id/N)
+- Sends only the needed <computer_additions>/<computer_deletions> in large batched PUTs
+- If the server rejects a batch, it is split in half and retried until the
+  offending serials are isolated
+- Reports a result for every serial (table OR JSON), even when the run stops
+  early because the server refused the update
+- --mode sync with an empty serial list is refused unless --allow-empty is given
+
+Usage examples:
+  python static_group_membership.py \
+    --url https://yourorg.jamfcloud.com \
+    --user API_USER --password '********' \
+    --group-id 123 --serials lab_macs.txt
+
+  # Make the group contain exactly the serials in the file
+  python static_group_membership.py ... --group-id 123 --serials lab_macs.txt --mode sync --json
+
+Requires: Python 3.8+
+"""
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence
+from xml.etree import ElementTree as ET
+
+from jamf_smart_group_grep import JamfClient
+
+
+# ---------- Configuration / Constants ----------
+
+MODES = ("add", "remove", "sync")
+DEFAULT_BATCH_SIZE = 500
+
+# Statuses that mean "this payload was refused" rather than "you may not do this at all"
+FATAL_STATUSES = (401, 403, 404)
+
+
+# ---------- Dataclasses ----------
+
+@dataclass
+class SerialResult:
+    serial: str
+    action: str  # "add", "remove" or "none"
+    status: str  # "added", "removed", "already member", "not a member", "failed"
+    detail: Optional[str] = None
+
+
+# ---------- Helpers ----------
+
+def read_serials(path: str) -> List[str]:
+    serials: List[str] = []
+    seen = set()
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            sn = line.split("#", 1)[0].strip().upper()
+            if sn and sn not in seen:
+                seen.add(sn)
+                serials.append(sn)
+    return serials
+
+
+def membership_payload(element: str, serials: Sequence[str]) -> bytes:
+    # <computer_group><computer_additions><computer><serial_number>..</serial_number></computer>...</computer_additions></computer_group>
+    root = ET.Element("computer_group")
+    block = ET.SubElement(root, element)
+    for sn in serials:
+        ET.SubElement(ET.SubElement(block, "computer"), "serial_number").text = sn
+    return ET.tostring(root, encoding="utf-8")
+
+
+def _error_text(resp) -> str:
+    text = (resp.text or "").strip()
+    try:
+        # Classic errors are HTML pages; keep just the message paragraph if present
+        node = ET.fromstring(resp.content).find(".//p")
+        if node is not None and node.text:
+            text = node.text.strip()
+    except ET.ParseError:
+        pass
+    return f"HTTP {resp.status_code}: {text[:200]}"
+
+
+def apply_batch(client: JamfClient, group_id: int, element: str, serials: List[str], stats: Dict[str, int],
+                results: Optional[Dict[str, Optional[str]]] = None) -> Dict[str, Optional[str]]:
+    """
+    PUTs one batch. On rejection the batch is bisected so a single bad serial
+    (unknown to Jamf, payload too large, ...) doesn't fail its neighbours.
+    Fills and returns results, {serial: None on success or error text}; if a
+    fatal status or request error is raised part way, results still holds the
+    halves that were already applied.
+    """
+    results = {} if results is None else results
+    stats["requests"] += 1
+    resp = client._classic_put(f"computergroups/id/{group_id}", membership_payload(element, serials))
+    if resp.ok:
+        results.update((sn, None) for sn in serials)
+        return results
+    if resp.status_code in FATAL_STATUSES:
+        raise RuntimeError(f"Group update refused, not retrying: {_error_text(resp)}")
+    if len(serials) == 1:
+        results[serials[0]] = _error_text(resp)
+        return results
+    mid = len(serials) // 2
+    print(f"Batch of {len(serials)} rejected ({resp.status_code}); splitting", file=sys.stderr)
+    apply_batch(client, group_id, element, serials[:mid], stats, results)
+    apply_batch(client, group_id, element, serials[mid:], stats, results)
+    return results
+
+
+def update_membership(client: JamfClient, group_id: int, serials: List[str], mode: str,
+                      batch_size: int = DEFAULT_BATCH_SIZE, allow_empty: bool = False) -> List[SerialResult]:
+    """
+    Returns one SerialResult per serial touched. If the server refuses the update
+    outright (401/403/404) or a request fails, the serials not yet applied are
+    reported as failed with that error instead of raising.
+    """
+    if mode == "sync" and not serials and not allow_empty:
+        raise ValueError("No serials given; sync would remove every member of the group.")
+    stats = {"requests": 1}
+    group, members = client.get_computer_group_members(group_id)
+    if group.is_smart:
+        raise RuntimeError(f"Group {group_id} ('{group.name}') is a smart group; membership can't be edited.")
+    current = {sn.upper() for sn in members}
+    wanted = set(serials)
+
+    results: Dict[str, SerialResult] = {}
+    additions: List[str] = []
+    deletions: List[str] = []
+    if mode in ("add", "sync"):
+        for sn in serials:
+            if sn in current:
+                results[sn] = SerialResult(sn, "none", "already member")
+            else:
+                additions.append(sn)
+    if mode == "remove":
+        for sn in serials:
+            if sn in current:
+                deletions.append(sn)
+            else:
+                results[sn] = SerialResult(sn, "none", "not a member")
+    if mode == "sync":
+        deletions = sorted(current - wanted)
+
+    aborted: Optional[str] = None
+    for element, action, done, todo in (
+        ("computer_additions", "add", "added", additions),
+        ("computer_deletions", "remove", "removed", deletions),
+    ):
+        for start in range(0, len(todo), batch_size):
+            batch = todo[start:start + batch_size]
+            applied: Dict[str, Optional[str]] = {}
+            if aborted is None:
+                try:
+                    apply_batch(client, group_id, element, batch, stats, applied)
+                except Exception as e:
+                    aborted = str(e) if isinstance(e, RuntimeError) else f"{type(e).__name__}: {e}"
+                    print(f"ERROR: {aborted}; remaining serials not attempted", file=sys.stderr)
+            for sn in batch:
+                if sn in applied:
+                    err = applied[sn]
+                    results[sn] = SerialResult(sn, action, "failed" if err else done, err)
+                else:
+                    results[sn] = SerialResult(sn, action, "failed", aborted)
+
+    print(f"Group '{group.name}' (id={group_id}): {len(additions)} to add, {len(deletions)} to remove, "
+          f"{stats['requests']} request(s)", file=sys.stderr)
+    ordered = [results[sn] for sn in serials if sn in results]
+    ordered.extend(results[sn] for sn in deletions if sn not in wanted)
+    return ordered
+
+
+# ---------- Output Helpers ----------
+
+def print_table(results: List[SerialResult]) -> None:
+    if not results:
+        print("Nothing to do.")
+        return
+    width = max(len(r.serial) for r in results)
+    for r in results:
+        line = f"  {r.serial:<{width}}  {r.status}"
+        if r.detail:
+            line += f" ({r.detail})"
+        print(line)
+    counts: Dict[str, int] = {}
+    for r in results:
+        counts[r.status] = counts.get(r.status, 0) + 1
+    print("\n" + ", ".join(f"{n} {status}" for status, n in sorted(counts.items())))
+
+
+# ---------- Main ----------
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch add/remove computers (by serial) in a Jamf static group.")
+    parser.add_argument("--url", required=True, help="Base Jamf Pro URL, e.g., https://yourorg.jamfcloud.com")
+    parser.add_argument("--user", help="Jamf API username (or set JAMF_USER)")
+    parser.add_argument("--password", help="Jamf API password (or set JAMF_PASS)")
+    parser.add_argument("--token", help="Pre-existing bearer token (alternatively, use --user/--password)")
+    parser.add_argument("--group-id", type=int, required=True, help="Static computer group ID")
+    parser.add_argument("--serials", required=True, help="File with one serial number per line")
+    parser.add_argument("--mode", choices=MODES, default="add",
+                        help="add (default), remove, or sync (also removes members not in the file)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Serials per PUT request (default: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--allow-empty", action="store_true",
+                        help="Let --mode sync run with an empty --serials file (empties the group)")
+    parser.add_argument("--json", action="store_true", help="Output JSON instead of a text table")
+    parser.add_argument("--no-verify-ssl", action="store_true", help="Disable TLS cert verification (not recommended)")
+
+    args = parser.parse_args()
+
+    username = args.user or os.getenv("JAMF_USER")
+    password = args.password or os.getenv("JAMF_PASS")
+    token = args.token or os.getenv("JAMF_TOKEN")
+
+    if not token and not (username and password):
+        parser.error("Provide --token OR --user/--password (or set JAMF_TOKEN / JAMF_USER / JAMF_PASS).")
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1.")
+    try:
+        serials = read_serials(args.serials)
+    except OSError as e:
+        parser.error(f"Cannot read --serials file: {e}")
+    if args.mode == "sync" and not serials and not args.allow_empty:
+        parser.error("--serials has no serial numbers; --mode sync would remove every member. "
+                     "Pass --allow-empty if that is intended.")
+
+    client = JamfClient(args.url, username, password, token=token, verify_ssl=not args.no_verify_ssl)
+    try:
+        results = update_membership(client, args.group_id, serials, args.mode, batch_size=args.batch_size,
+                                    allow_empty=args.allow_empty)
+    except Exception as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps([asdict(r) for r in results], indent=2))
+    else:
+        print_table(results)
+    if any(r.status == "failed" for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
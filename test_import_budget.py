@@ -0,0 +1,26 @@
+"""
+Cold-start import budget for the command-line tools (see bench_import_time.py).
+
+Run with: python -m pytest -q test_import_budget.py
+"""
+
+import importlib.util
+
+import pytest
+
+from bench_import_time import DEFAULT_BUDGET_MS, DEFAULT_RUNS, GUI_SCRIPTS, SCRIPTS, interpreter_baseline, measure
+
+
+@pytest.fixture(scope="module")
+def baseline_us() -> int:
+    return interpreter_baseline(DEFAULT_RUNS)
+
+
+@pytest.mark.parametrize("script", SCRIPTS + GUI_SCRIPTS)
+def test_import_budget(script, baseline_us):
+    if script in GUI_SCRIPTS and importlib.util.find_spec("tkinter") is None:
+        pytest.skip("tkinter not available")
+    ms, heavy, returncode = measure(script, DEFAULT_RUNS, baseline_us)
+    assert returncode == 0, f"{script} exited {returncode}"
+    assert not heavy, f"{script} loads {', '.join(heavy)} just to start"
+    assert ms <= DEFAULT_BUDGET_MS, f"{script} imports take {ms:.1f} ms (budget {DEFAULT_BUDGET_MS:.0f} ms)"